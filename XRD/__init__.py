@@ -9,23 +9,37 @@ Date: October 2025
 Version: Beta 0.3
 """
 
+import importlib
+import os
+
 __version__ = "0.3.0-beta"
 __author__ = "William Gonzalez, Adrian Guzman, Luke Davenport"
 
-# Core exports
-from XRD.core.gsas_processing import XRDDataset, GSASParams, PeakParams, Stages
-from XRD.core.image_loader import ImageLoader, ImageFrameInfo
-
-# Processing exports
-from XRD.processing.recipes import create_gsas_params_from_recipe, load_recipe_from_file
-
-# Visualization exports
-from XRD.visualization.data_visualization import create_visualization, GraphParams, GraphSetting
+# Public names are resolved lazily (PEP 562) so that `import XRD` does not pull
+# GSAS-II, Dask and Matplotlib into every process (e.g. Dask workers).
+# Names are grouped by providing module: the first access to any of them
+# imports the module once and binds the whole group.
+_LAZY_GROUPS = {
+    # Core exports (routed through the XRD.core namespace)
+    'XRD.core': (
+        'XRDDataset', 'GSASParams', 'PeakParams', 'Stages',
+        'ImageLoader', 'ImageFrameInfo',
+    ),
+    # Processing exports
+    'XRD.processing.recipes': (
+        'create_gsas_params_from_recipe', 'load_recipe_from_file',
+    ),
+    # Visualization exports
+    'XRD.visualization.data_visualization': (
+        'create_visualization', 'GraphParams', 'GraphSetting',
+    ),
+    # HPC exports
+    'XRD.hpc.cluster': (
+        'get_dask_client', 'close_dask_client',
+    ),
+}
 
-# HPC exports
-from XRD.hpc.cluster import get_dask_client, close_dask_client
-
-__all__ = [
+__all__ = (
     # Core
     'XRDDataset', 'GSASParams', 'PeakParams', 'Stages',
     'ImageLoader', 'ImageFrameInfo',
@@ -35,4 +49,36 @@ __all__ = [
     'create_visualization', 'GraphParams', 'GraphSetting',
     # HPC
     'get_dask_client', 'close_dask_client',
-]
+)
+
+# Headless workers can drop the visualization (Matplotlib) and HPC exports so
+# they are never imported through the package namespace
+_OPT_OUT = {
+    'PRISMA_NO_VIZ': 'XRD.visualization.data_visualization',
+    'PRISMA_NO_HPC': 'XRD.hpc.cluster',
+}
+for _flag, _module in _OPT_OUT.items():
+    if os.environ.get(_flag):
+        del _LAZY_GROUPS[_module]
+del _flag, _module
+
+_NAME2GROUP = {
+    name: module for module, names in _LAZY_GROUPS.items() for name in names
+}
+__all__ = tuple(name for name in __all__ if name in _NAME2GROUP)
+_ALL_SET = frozenset(__all__)
+
+
+def __getattr__(name):
+    """Import the submodule providing ``name`` and bind its whole group."""
+    if name not in _ALL_SET:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    path = _NAME2GROUP[name]
+    module = importlib.import_module(path)
+    # Later lookups of any name in the group bypass __getattr__
+    globals().update({n: getattr(module, n) for n in _LAZY_GROUPS[path]})
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(_ALL_SET.union(globals()))
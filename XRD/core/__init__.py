@@ -7,30 +7,56 @@ Date: October 2025
 Version: Beta 0.1
 """
 
-from XRD.core.gsas_processing import (
-    XRDDataset,
-    GSASParams,
-    PeakParams,
-    Stages,
-    process_images,
-    load_or_process_data,
-    subtract_datasets
-)
-from XRD.core.image_loader import (
-    ImageLoader,
-    ImageFrameInfo,
-    validate_frame_ordering
-)
+import importlib
 
-__all__ = [
+# Resolved lazily (PEP 562), grouped by providing module; see XRD/__init__.py
+_LAZY_GROUPS = {
+    'XRD.core.gsas_processing': (
+        'XRDDataset',
+        'GSASParams',
+        'PeakParams',
+        'Stages',
+        'Precision',
+        'process_images',
+        'load_or_process_data',
+        'subtract_datasets',
+    ),
+    'XRD.core.image_loader': (
+        'ImageLoader',
+        'ImageFrameInfo',
+        'validate_frame_ordering',
+    ),
+}
+
+__all__ = (
     'XRDDataset',
     'GSASParams',
     'PeakParams',
     'Stages',
+    'Precision',
     'process_images',
     'load_or_process_data',
     'subtract_datasets',
     'ImageLoader',
     'ImageFrameInfo',
     'validate_frame_ordering',
-]
+)
+_ALL_SET = frozenset(__all__)
+_NAME2GROUP = {
+    name: module for module, names in _LAZY_GROUPS.items() for name in names
+}
+
+
+def __getattr__(name):
+    """Import the submodule providing ``name`` and bind its whole group."""
+    if name not in _ALL_SET:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    path = _NAME2GROUP[name]
+    module = importlib.import_module(path)
+    # Later lookups of any name in the group bypass __getattr__
+    globals().update({n: getattr(module, n) for n in _LAZY_GROUPS[path]})
+    return globals()[name]
+
+
+def __dir__():
+    return sorted(_ALL_SET.union(globals()))
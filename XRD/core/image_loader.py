@@ -10,8 +10,15 @@ Version: Beta 0.1
 """
 
 import os
-from typing import List, Tuple, Optional, Dict
-from dataclasses import dataclass
+import sys
+import json
+import functools
+import itertools
+import threading
+from collections import OrderedDict
+from types import MappingProxyType
+from typing import Iterator, List, Tuple, Optional, Dict, Mapping, Sequence
+from dataclasses import dataclass, field
 import numpy as np
 
 try:
@@ -21,15 +28,238 @@ except ImportError:
     FABIO_AVAILABLE = False
     print("Warning: FABIO not available. Multi-frame EDF/GE5 support disabled.")
 
+# Reading EDF data blocks directly (_frame_stack, _read_plain_edf_frame) relies on
+# FABIO's private EDF frame table (_frames, start, blobsize, _dtype, ...). It is
+# used only with the FABIO releases it was verified against; other versions
+# read every frame through img.getframe.
+_FABIO_FRAME_TABLE_VERSIONS = ((2026, 0), (2027, 0))
+FABIO_FRAME_TABLE = (FABIO_AVAILABLE and _FABIO_FRAME_TABLE_VERSIONS[0]
+                     <= tuple(getattr(fabio, 'version_info', (0, 0))[:2])
+                     < _FABIO_FRAME_TABLE_VERSIONS[1])
 
-@dataclass
+# tifffile is optional - memory-maps uncompressed single-frame TIFs
+try:
+    import tifffile
+    TIFFFILE_AVAILABLE = True
+except ImportError:
+    TIFFFILE_AVAILABLE = False
+
+
+# Frames of a cached image share its file object, so frame reads through
+# cached handles are serialized (frames are processed from several threads).
+# Opening files needs no lock: each open has its own file object.
+_FABIO_LOCK = threading.RLock()
+
+# Recently opened FABIO images, keyed by (path, mtime_ns, size) so a rewritten
+# file is reopened. Evicted images are only dropped from the cache: their file
+# closes once the last in-flight read releases it. ImageLoader.clear_cache()
+# closes every cached handle at once.
+_FABIO_CACHE_SIZE = 8
+_FABIO_HANDLES: "OrderedDict[Tuple[str, int, int], object]" = OrderedDict()
+_FABIO_CACHE_LOCK = threading.Lock()
+
+
+def _file_version(filepath: str) -> Tuple[int, int]:
+    """(mtime_ns, size) of filepath, identifying one version of its contents."""
+    stat = os.stat(filepath)
+    return stat.st_mtime_ns, stat.st_size
+
+
+def _open_fabio(filepath: str, version: Optional[Tuple[int, int]] = None):
+    """
+    Open an image with FABIO, reusing the handle for recently opened files.
+
+    fabio.open parses the file structure (frame sizes, compressed block offsets)
+    on every call, so frame counts, per-frame headers and frame data of a
+    multi-frame file all share one opened image. The handle is reused only while
+    the file's (mtime, size) version is unchanged; version defaults to a fresh
+    stat. Hold _FABIO_LOCK while reading frames from the returned image.
+    """
+    if version is None:
+        version = _file_version(filepath)
+    key = (filepath,) + tuple(version)
+    with _FABIO_CACHE_LOCK:
+        img = _FABIO_HANDLES.get(key)
+        if img is not None:
+            _FABIO_HANDLES.move_to_end(key)
+            return img
+
+    img = fabio.open(filepath)
+    with _FABIO_CACHE_LOCK:
+        cached = _FABIO_HANDLES.get(key)
+        if cached is not None:
+            # Opened concurrently by another thread; keep the cached handle
+            img.close()
+            _FABIO_HANDLES.move_to_end(key)
+            return cached
+        # Handles of older versions of this file are never served again
+        for stale in [k for k in _FABIO_HANDLES if k[0] == filepath]:
+            del _FABIO_HANDLES[stale]
+        _FABIO_HANDLES[key] = img
+        while len(_FABIO_HANDLES) > _FABIO_CACHE_SIZE:
+            _FABIO_HANDLES.popitem(last=False)
+    return img
+
+
+# Opt-in: keep a hidden frame index (.prisma_index.json) in each scanned
+# directory with the frame counts of its multi-frame files, so later runs
+# skip opening them
+FRAME_INDEX_CACHE = os.environ.get('PRISMA_FRAME_INDEX') == '1'
+_FRAME_INDEX_NAME = '.prisma_index.json'
+
+
+@functools.lru_cache(maxsize=1024)
+def _cached_frame_count(filepath: str, mtime_ns: int, size: int) -> int:
+    """
+    Frame count of filepath as of the given modification time and size.
+
+    Keyed on (path, mtime, size), so a rewritten file is re-scanned: the
+    handle is looked up under the same version, never a stale one of the path.
+    Failures raise and are therefore not cached.
+    """
+    return _open_fabio(filepath, (mtime_ns, size)).nframes
+
+
+def _plain_edf_block(frame) -> Optional[Tuple[np.dtype, Tuple[int, ...]]]:
+    """
+    (stored dtype, shape) of an EDF frame whose data is a plain block in its file.
+
+    None when the block needs FABIO to decode it: compressed data, gzip/bz2
+    file, external binary file, truncated block, already decoded, or not an
+    EDF frame at all.
+    """
+    try:
+        compression = frame._data_compression
+        dtype = frame._dtype
+        if ((compression is not None and compression != 'NONE') or frame.bfname is not None
+                or dtype is None or frame._data is not None
+                or type(frame.file) is not fabio.fabioutils.File):
+            return None
+        shape = tuple(frame.shape)
+        stored = np.dtype(dtype).newbyteorder(frame._data_byteorder.value)
+        if frame.blobsize < int(np.prod(shape)) * stored.itemsize:
+            return None  # Truncated block: let FABIO pad it
+    except (AttributeError, TypeError, ValueError):
+        return None
+    return stored, shape
+
+
+@dataclass(frozen=True)
+class FileSchema:
+    """
+    Layout of a multi-frame file whose frames are identical plain data blocks
+    at a fixed spacing, so frame i starts at base_offset + i * frame_stride.
+    """
+    dtype: np.dtype         # Stored (native byte order) data type
+    shape: Tuple[int, ...]  # Frame shape
+    frame_stride: int       # Bytes from one frame's data to the next
+    base_offset: int        # Byte offset of frame 0's data
+    nframes: int            # Number of frames
+
+
+def _file_schema(img, size: int) -> Optional[FileSchema]:
+    """
+    FileSchema of an opened EDF image of size bytes, or None if its frames are
+    not uniform, do not fit in the file or FABIO's frame table is unavailable.
+    """
+    if not FABIO_FRAME_TABLE:
+        return None
+    try:
+        frames = img._frames
+        if not frames:
+            return None
+        first = _plain_edf_block(frames[0])
+        if first is None or not first[0].isnative:
+            return None
+        base_offset = int(frames[0].start)
+        frame_stride = int(frames[1].start) - base_offset if len(frames) > 1 else 0
+        for index, frame in enumerate(frames):
+            if frame.start != base_offset + index * frame_stride or _plain_edf_block(frame) != first:
+                return None
+    except (AttributeError, TypeError, ValueError):
+        return None
+    frame_bytes = int(np.prod(first[1])) * first[0].itemsize
+    if frame_stride < 0 or base_offset + (len(frames) - 1) * frame_stride + frame_bytes > size:
+        return None
+    return FileSchema(dtype=first[0], shape=first[1], frame_stride=frame_stride,
+                      base_offset=base_offset, nframes=len(frames))
+
+
+# Memory-mapped frame stacks of recently read files: path -> (version, stack).
+# A new (mtime, size) version of a file replaces its entry, so a rewritten file
+# is mapped afresh and its old mapping is released with the last view into it.
+_FRAME_STACK_CACHE_SIZE = 8
+_FRAME_STACKS: "OrderedDict[str, Tuple[Tuple[int, int], Optional[np.ndarray]]]" = OrderedDict()
+
+
+def _frame_stack(filepath: str, version: Tuple[int, int]) -> Optional[np.ndarray]:
+    """
+    Read-only (nframes, *shape) view of a uniform multi-frame file, memory-mapped once.
+
+    Frames are then plain views: no FABIO parsing, header copy or read call per
+    frame. The mapping is reused only while the file's (mtime, size) version is
+    unchanged, and is only made when every frame lies within the file. None when
+    the file has no FileSchema (FABIO reads it instead).
+    """
+    with _FABIO_CACHE_LOCK:
+        entry = _FRAME_STACKS.get(filepath)
+        if entry is not None and entry[0] == version:
+            _FRAME_STACKS.move_to_end(filepath)
+            return entry[1]
+
+    stack = None
+    schema = _file_schema(_open_fabio(filepath, version), version[1])
+    if schema is not None:
+        mapped = np.memmap(filepath, dtype=np.uint8, mode='r')
+        item_strides = np.empty(schema.shape, dtype=schema.dtype).strides
+        stack = np.ndarray(shape=(schema.nframes,) + schema.shape, dtype=schema.dtype, buffer=mapped,
+                           offset=schema.base_offset, strides=(schema.frame_stride,) + item_strides)
+    with _FABIO_CACHE_LOCK:
+        _FRAME_STACKS[filepath] = (version, stack)
+        _FRAME_STACKS.move_to_end(filepath)
+        while len(_FRAME_STACKS) > _FRAME_STACK_CACHE_SIZE:
+            _FRAME_STACKS.popitem(last=False)
+    return stack
+
+
+# Shared read-only metadata of frames without a header (single-frame files)
+_EMPTY_METADATA = MappingProxyType({})
+
+
+@dataclass(init=False, frozen=True, slots=True)
 class ImageFrameInfo:
-    """Information about a single frame from an image file."""
+    """
+    Information about a single frame from an image file.
+
+    Frame metadata may be left unread (None) at construction; it is then read
+    from the file header the first time .metadata is accessed. Instances are
+    immutable and hashable (metadata does not take part in equality).
+    """
     file_path: str          # Path to the source file
     frame_index: int        # Frame index within the file (0-based)
     file_frame_index: int   # Original frame number in multi-frame file
     is_multiframe: bool     # Whether source is multi-frame file
-    metadata: Dict          # Frame-specific metadata (timestamps, etc.)
+    _metadata: Optional[Dict] = field(default=None, repr=False, compare=False)
+
+    def __init__(self, file_path: str, frame_index: int, file_frame_index: int,
+                 is_multiframe: bool, metadata: Optional[Dict] = None):
+        object.__setattr__(self, 'file_path', file_path)
+        object.__setattr__(self, 'frame_index', frame_index)
+        object.__setattr__(self, 'file_frame_index', file_frame_index)
+        object.__setattr__(self, 'is_multiframe', is_multiframe)
+        object.__setattr__(self, '_metadata', metadata)
+
+    @property
+    def metadata(self) -> Mapping:
+        """Frame-specific metadata (timestamps, etc.), read on first access."""
+        if self._metadata is not None:
+            return self._metadata
+        if not self.is_multiframe:
+            return _EMPTY_METADATA
+        metadata = ImageLoader.get_frame_metadata(self.file_path, self.file_frame_index)
+        # Header cache only; not part of the frame's identity
+        object.__setattr__(self, '_metadata', metadata)
+        return metadata
 
 
 class ImageLoader:
@@ -44,38 +274,75 @@ class ImageLoader:
     SUPPORTED_MULTI_FRAME = ['.edf', '.edf.ge5', '.edf.ge1', '.edf.ge2',
                              '.edf.ge3', '.edf.ge4']
 
+    # Lookup forms of the lists above (membership tests run once per file)
+    _SINGLE_SET = frozenset(SUPPORTED_SINGLE_FRAME)
+    _MULTI_SET = frozenset(SUPPORTED_MULTI_FRAME)
+    # Last suffixes of the compound .edf.geN extensions
+    _GE_SUFFIXES = frozenset(['.ge5', '.ge1', '.ge2', '.ge3', '.ge4'])
+
     @classmethod
     def is_supported(cls, filepath: str) -> bool:
         """Check if file format is supported."""
         ext = cls._get_extension(filepath)
-        return (ext in cls.SUPPORTED_SINGLE_FRAME or
-                ext in cls.SUPPORTED_MULTI_FRAME)
+        return ext in cls._SINGLE_SET or ext in cls._MULTI_SET
 
     @classmethod
     def is_multiframe(cls, filepath: str) -> bool:
         """Check if file is a multi-frame format."""
-        ext = cls._get_extension(filepath)
-        return ext in cls.SUPPORTED_MULTI_FRAME
+        return cls._get_extension(filepath) in cls._MULTI_SET
 
-    @staticmethod
-    def _get_extension(filepath: str) -> str:
+    @classmethod
+    def _get_extension(cls, filepath: str) -> str:
         """Get file extension, handling compound extensions like .edf.GE5"""
         filename = os.path.basename(filepath).lower()
 
-        # Check for compound extensions first
-        for ext in ['.edf.ge5', '.edf.ge1', '.edf.ge2', '.edf.ge3', '.edf.ge4']:
-            if filename.endswith(ext):
-                return ext
+        # Last suffix, as os.path.splitext finds it (leading dots do not count)
+        dot = filename.rfind('.')
+        if dot <= 0 or (filename[0] == '.' and not filename[:dot].lstrip('.')):
+            return ''
+        ext = filename[dot:]
 
-        # Check for simple extensions
-        _, ext = os.path.splitext(filename)
+        # Compound extensions: .geN preceded by .edf
+        if ext in cls._GE_SUFFIXES and filename.endswith('.edf', 0, dot):
+            return '.edf' + ext
         return ext
 
+    @classmethod
+    def _iter_image_files(cls, directory: str) -> Iterator[Tuple[str, bool]]:
+        """
+        Yield (path, is_multiframe) of supported image files under directory.
+
+        Recursive and unordered. Walks with os.scandir and classifies each
+        DirEntry name once, so rejected files cost no stat call. Like os.walk,
+        symlinked directories are listed but not descended and unreadable
+        directories are skipped.
+        """
+        try:
+            entries = os.scandir(directory)
+        except OSError:
+            return
+        with entries:
+            for entry in entries:
+                try:
+                    is_dir = entry.is_dir()
+                except OSError:
+                    is_dir = False
+                if is_dir:
+                    if not entry.is_symlink():
+                        yield from cls._iter_image_files(entry.path)
+                    continue
+                ext = cls._get_extension(entry.name)
+                if ext in cls._MULTI_SET:
+                    yield entry.path, True
+                elif ext in cls._SINGLE_SET:
+                    yield entry.path, False
+
     @classmethod
     def discover_frames(cls, directory: str,
                        start_frame: int = 0,
                        end_frame: int = -1,
-                       step: int = 1) -> List[ImageFrameInfo]:
+                       step: int = 1,
+                       lazy_metadata: bool = True) -> List[ImageFrameInfo]:
         """
         Discover all image frames in a directory.
 
@@ -87,96 +354,197 @@ class ImageLoader:
             start_frame: Starting frame index (global across all files)
             end_frame: Ending frame index (-1 for all frames)
             step: Frame sampling step
+            lazy_metadata: Defer reading multi-frame headers until a frame's
+                metadata is first accessed (False reads them all here)
 
         Returns:
             List of ImageFrameInfo objects in sequential order
         """
-        frames = []
-        global_frame_index = 0
-
-        # Get all files in directory
-        all_files = []
-        for root, dirs, files in os.walk(directory):
-            for file in sorted(files):
-                filepath = os.path.join(root, file)
-                if cls.is_supported(filepath):
-                    all_files.append(filepath)
-
-        # Process each file
-        for filepath in sorted(all_files):
-            if cls.is_multiframe(filepath):
-                # Multi-frame file: enumerate all frames
-                frame_count = cls.get_frame_count(filepath)
-                if frame_count is None:
-                    print(f"Warning: Could not read frame count from {filepath}")
-                    continue
+        return list(cls.iter_frames(directory, start_frame, end_frame, step, lazy_metadata))
 
-                for file_frame_idx in range(frame_count):
-                    # Check if this frame meets the criteria
-                    if end_frame != -1 and global_frame_index >= end_frame:
-                        break
+    @classmethod
+    def iter_frames(cls, directory: str,
+                    start_frame: int = 0,
+                    end_frame: int = -1,
+                    step: int = 1,
+                    lazy_metadata: bool = True) -> Iterator[ImageFrameInfo]:
+        """
+        Generator form of discover_frames (same arguments), yielding frames in
+        sequential order without building the list. File frame counts are still
+        probed up front; frame records (and eager headers) are produced on demand.
+        """
+        # Get all supported files in directory, sorted once by path
+        all_files = sorted(cls._iter_image_files(directory))
+
+        # Frame counts of the multi-frame files, probed concurrently
+        multiframe_files = [filepath for filepath, multiframe in all_files if multiframe]
+        if FRAME_INDEX_CACHE:
+            frame_counts = cls._indexed_frame_counts(directory, multiframe_files)
+        else:
+            frame_counts = cls._probe_frame_counts(multiframe_files)
+
+        files = []
+        counts = []
+        for filepath, multiframe in all_files:
+            count = frame_counts[filepath] if multiframe else 1
+            if count is None:
+                print(f"Warning: Could not read frame count from {filepath}")
+                continue
+            files.append((filepath, multiframe))
+            counts.append(count)
+
+        # Global index of each file's first frame; selected global indices are
+        # the multiples of step in [start_frame, end_frame)
+        offsets = np.concatenate(([0], np.cumsum(counts, dtype=np.int64)))
+        total_frames = int(offsets[-1])
+        stop = total_frames if end_frame == -1 else min(end_frame, total_frames)
+        first = -(-max(start_frame, 0) // step) * step
+        selected = np.arange(first, stop, step, dtype=np.int64)
+
+        # Map each selected global index to (file, frame within file)
+        file_indices = np.searchsorted(offsets, selected, side='right') - 1
+        local_indices = selected - offsets[file_indices]
+
+        for global_idx, file_idx, file_frame_idx in zip(selected.tolist(), file_indices.tolist(),
+                                                        local_indices.tolist()):
+            filepath, multiframe = files[file_idx]
+            # Header of multi-frame frames (None = read on first access)
+            metadata = (cls.get_frame_metadata(filepath, file_frame_idx)
+                        if multiframe and not lazy_metadata else None)
+            yield ImageFrameInfo(
+                file_path=filepath,
+                frame_index=global_idx,
+                file_frame_index=file_frame_idx,
+                is_multiframe=multiframe,
+                metadata=metadata
+            )
 
-                    if (global_frame_index >= start_frame and
-                        global_frame_index % step == 0):
+    @classmethod
+    def _probe_frame_counts(cls, filepaths: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Frame counts of several files, keyed by path.
 
-                        # Get metadata for this frame
-                        metadata = cls.get_frame_metadata(filepath, file_frame_idx)
+        Opening a multi-frame file parses its whole structure, and each file is
+        independent I/O, so with more than one file the opens run as dask.delayed
+        tasks on the threaded scheduler (handles land in the shared FABIO cache).
+        """
+        if len(filepaths) < 2:
+            return {f: cls.get_frame_count(f) for f in filepaths}
 
-                        frames.append(ImageFrameInfo(
-                            file_path=filepath,
-                            frame_index=global_frame_index,
-                            file_frame_index=file_frame_idx,
-                            is_multiframe=True,
-                            metadata=metadata
-                        ))
+        import dask
+        counts = dask.compute(*[dask.delayed(cls.get_frame_count)(f) for f in filepaths],
+                              scheduler='threads')
+        return dict(zip(filepaths, counts))
 
-                    global_frame_index += 1
+    @classmethod
+    def _indexed_frame_counts(cls, directory: str, filepaths: List[str]) -> Dict[str, Optional[int]]:
+        """
+        Frame counts of files under directory, served from its frame index.
 
-                if end_frame != -1 and global_frame_index >= end_frame:
-                    break
+        Entries are keyed by path relative to directory and validated against
+        the file's mtime and size; only missing or stale files are probed. The
+        index is rewritten when it changed (failures, e.g. read-only data
+        directories, are ignored).
+        """
+        index_path = os.path.join(directory, _FRAME_INDEX_NAME)
+        try:
+            with open(index_path, 'r') as f:
+                index = json.load(f)['files']
+        except (OSError, ValueError, KeyError, TypeError):
+            index = {}  # Missing or unreadable index: probe everything
+
+        counts = {}
+        stamps = {}
+        stale = []
+        for filepath in filepaths:
+            key = os.path.relpath(filepath, directory)
+            try:
+                stat = os.stat(filepath)
+            except OSError:
+                stale.append(filepath)
+                continue
+            stamps[filepath] = [stat.st_mtime_ns, stat.st_size]
+            entry = index.get(key)
+            if isinstance(entry, list) and entry[:2] == stamps[filepath] and len(entry) == 3:
+                counts[filepath] = entry[2]
             else:
-                # Single-frame file
-                if end_frame != -1 and global_frame_index >= end_frame:
-                    break
-
-                if (global_frame_index >= start_frame and
-                    global_frame_index % step == 0):
-
-                    frames.append(ImageFrameInfo(
-                        file_path=filepath,
-                        frame_index=global_frame_index,
-                        file_frame_index=0,
-                        is_multiframe=False,
-                        metadata={}
-                    ))
+                stale.append(filepath)
+        counts.update(cls._probe_frame_counts(stale))
+
+        updated = {os.path.relpath(filepath, directory): stamps[filepath] + [count]
+                   for filepath, count in counts.items()
+                   if count is not None and filepath in stamps}
+        if updated != index:
+            try:
+                with open(index_path, 'w') as f:
+                    json.dump({'files': updated}, f)
+            except OSError:
+                pass
+        return counts
 
-                global_frame_index += 1
+    @staticmethod
+    def clear_cache() -> None:
+        """
+        Close every cached FABIO file handle.
 
-        return frames
+        Call before rewriting or deleting image files that were read in this
+        process (open handles lock files on Windows). Later reads reopen them.
+        """
+        with _FABIO_CACHE_LOCK:
+            handles = list(_FABIO_HANDLES.values())
+            _FABIO_HANDLES.clear()
+            _FRAME_STACKS.clear()
+        with _FABIO_LOCK:
+            for img in handles:
+                img.close()
 
     @staticmethod
     def get_frame_count(filepath: str) -> Optional[int]:
-        """Get number of frames in a file."""
+        """Get number of frames in a file (cached until the file changes)."""
         if not FABIO_AVAILABLE:
             return None
 
         try:
-            img = fabio.open(filepath)
-            return img.nframes
+            stat = os.stat(filepath)
+            return _cached_frame_count(filepath, stat.st_mtime_ns, stat.st_size)
         except Exception as e:
             print(f"Error reading frame count from {filepath}: {e}")
             return None
 
     @staticmethod
-    def get_frame_metadata(filepath: str, frame_index: int = 0) -> Dict:
-        """Get metadata for a specific frame."""
+    def get_frame_metadata(filepath: str, frame_index: int = 0,
+                           keys: Optional[Sequence[str]] = None) -> Dict:
+        """
+        Get metadata for a specific frame.
+
+        Args:
+            filepath: Image file path
+            frame_index: Frame index within the file
+            keys: Header keys to return (those present); None copies the whole header
+        """
         if not FABIO_AVAILABLE:
             return {}
 
         try:
-            img = fabio.open(filepath)
-            frame = img.getframe(frame_index)
-            return dict(frame.header) if hasattr(frame, 'header') else {}
+            img = _open_fabio(filepath)
+        except Exception as e:
+            print(f"Error reading metadata from {filepath} frame {frame_index}: {e}")
+            return {}
+        return ImageLoader._read_frame_header(img, filepath, frame_index, keys)
+
+    @staticmethod
+    def _read_frame_header(img, filepath: str, frame_index: int,
+                           keys: Optional[Sequence[str]] = None) -> Dict:
+        """Header (or the given keys of it) of one frame of an already opened FABIO image."""
+        try:
+            with _FABIO_LOCK:
+                frame = img.getframe(frame_index)
+                if not hasattr(frame, 'header'):
+                    return {}
+                header = frame.header
+                if keys is None:
+                    return dict(header)
+                return {k: header[k] for k in keys if k in header}
         except Exception as e:
             print(f"Error reading metadata from {filepath} frame {frame_index}: {e}")
             return {}
@@ -200,15 +568,17 @@ class ImageLoader:
 
         try:
             # Load the frame
-            img = fabio.open(frame_info.file_path)
+            img = _open_fabio(frame_info.file_path)
 
-            if frame_info.is_multiframe:
-                frame = img.getframe(frame_info.file_frame_index)
-            else:
-                frame = img
+            with _FABIO_LOCK:
+                if frame_info.is_multiframe:
+                    frame = img.getframe(frame_info.file_frame_index)
+                else:
+                    frame = img
+                data, header = frame.data, frame.header
 
             # Save as TIF
-            tif_img = fabio.tifimage.TifImage(data=frame.data, header=frame.header)
+            tif_img = fabio.tifimage.TifImage(data=data, header=header)
             tif_img.write(output_path)
 
             return True
@@ -218,34 +588,203 @@ class ImageLoader:
             return False
 
     @staticmethod
-    def load_frame_data(frame_info: ImageFrameInfo) -> Optional[np.ndarray]:
+    def load_frame_data(frame_info: ImageFrameInfo, copy: bool = False) -> Optional[np.ndarray]:
         """
         Load frame data as NumPy array.
 
+        Uncompressed single-frame TIFs are memory-mapped (read-only) when
+        tifffile is installed; everything else is decoded through FABIO. Without
+        copy, the array may be the memory map or the buffer of the cached FABIO
+        image itself, so callers must not modify it.
+
         Args:
             frame_info: Frame information
+            copy: Return an owned array the caller may modify
 
         Returns:
             NumPy array of image data, or None on error
         """
+        if TIFFFILE_AVAILABLE and not frame_info.is_multiframe:
+            try:
+                data = tifffile.memmap(frame_info.file_path, mode='r')
+                return np.array(data) if copy else data
+            except ValueError:
+                pass  # Compressed or tiled: not memory-mappable, decode instead
+            except Exception as e:
+                print(f"Error loading frame data: {e}")
+                return None
+
         if not FABIO_AVAILABLE:
             print("Error: FABIO not available for frame loading")
             return None
 
         try:
-            img = fabio.open(frame_info.file_path)
+            version = _file_version(frame_info.file_path)
+            img = _open_fabio(frame_info.file_path, version)
 
             if frame_info.is_multiframe:
-                frame = img.getframe(frame_info.file_frame_index)
-            else:
-                frame = img
-
-            return frame.data
+                # Uniform plain EDF stacks: view into the file's memory map
+                stack = _frame_stack(frame_info.file_path, version)
+                if stack is not None and frame_info.file_frame_index < len(stack):
+                    data = stack[frame_info.file_frame_index]
+                    return data.copy() if copy else data
+
+                # Other plain EDF blocks are read straight from the file (fresh array)
+                data = ImageLoader._read_plain_edf_frame(img, frame_info)
+                if data is not None:
+                    return data
+
+            with _FABIO_LOCK:
+                if frame_info.is_multiframe:
+                    frame = img.getframe(frame_info.file_frame_index)
+                else:
+                    frame = img
+                # Decoded buffer of the image, kept alive by the handle cache
+                data = np.asarray(frame.data)
+
+            return data.copy() if copy else data
 
         except Exception as e:
             print(f"Error loading frame data: {e}")
             return None
 
+    @staticmethod
+    def _read_plain_edf_frame(img, frame_info: ImageFrameInfo) -> Optional[np.ndarray]:
+        """
+        Read one frame of an opened EDF image using its frame table.
+
+        fabio.open already located every data block (byte offset, size, dtype,
+        shape), so an uncompressed block in the file itself is a single read at
+        a known offset; getframe would instead build a new image and copy the
+        frame header. Reads use their own file descriptor, so no lock is held.
+        Returns None when the block needs FABIO (compressed or gzip/bz2 file,
+        external binary file, already decoded, not an EDF image, FABIO version
+        outside _FABIO_FRAME_TABLE_VERSIONS).
+        """
+        if not FABIO_FRAME_TABLE:
+            return None
+        try:
+            frames = img._frames
+            if not 0 <= frame_info.file_frame_index < len(frames):
+                return None
+            frame = frames[frame_info.file_frame_index]
+            block = _plain_edf_block(frame)
+            if block is None:
+                return None
+            offset = int(frame.start)
+        except (AttributeError, TypeError, ValueError):
+            return None
+
+        stored, shape = block
+        count = int(np.prod(shape))
+        data = np.fromfile(frame_info.file_path, dtype=stored, count=count, offset=offset)
+        if data.size != count:
+            return None  # File shrank since it was opened: let FABIO report it
+        return data.reshape(shape).astype(stored.newbyteorder('='), copy=False)
+
+    @classmethod
+    def load_frames_sequential(cls, frame_infos: List[ImageFrameInfo]) -> Iterator[Optional[np.ndarray]]:
+        """
+        Load the data of several frames in order, streaming runs of consecutive frames.
+
+        Consecutive frames of one EDF file are read in a single pass with
+        EdfImage.lazy_iterator instead of a random-access getframe per frame.
+        Other frames (single-frame files, GE files, non-consecutive picks) go
+        through load_frame_data.
+
+        Args:
+            frame_infos: Frames to load, in the order they are wanted
+
+        Yields:
+            NumPy array of each frame's data (None on error), in input order
+        """
+        for filepath, group in itertools.groupby(frame_infos, key=lambda f: f.file_path):
+            group = list(group)
+            if cls._is_edf_run(group):
+                n_streamed = 0
+                try:
+                    for frame in cls._stream_edf_run(group):
+                        yield frame.data
+                        n_streamed += 1
+                except Exception as e:
+                    print(f"Error streaming frames from {filepath}: {e}")
+                # Anything the stream did not deliver is read frame by frame
+                group = group[n_streamed:]
+
+            for frame_info in group:
+                yield cls.load_frame_data(frame_info)
+
+    @classmethod
+    def extract_frames_to_tif(cls, frame_infos: List[ImageFrameInfo], output_dir: str,
+                              num_workers: Optional[int] = None) -> List[Optional[str]]:
+        """
+        Extract many frames to .tif files in parallel.
+
+        Frames are grouped by source file, one Dask task per file, so each file
+        is opened once per worker and consecutive EDF frames are streamed
+        (see load_frames_sequential). Tasks run on the process scheduler; frozen
+        (PyInstaller) builds cannot spawn worker interpreters and use threads.
+
+        Args:
+            frame_infos: Frames to extract
+            output_dir: Directory for the .tif files (frame_<frame_index>.tif)
+            num_workers: Number of workers (None = Dask default)
+
+        Returns:
+            Output path of each frame in input order, None where extraction failed
+        """
+        import dask
+
+        os.makedirs(output_dir, exist_ok=True)
+        output_paths = [os.path.join(output_dir, f"frame_{fi.frame_index:05d}.tif")
+                        for fi in frame_infos]
+
+        tasks = []
+        position = 0
+        for _, group in itertools.groupby(frame_infos, key=lambda f: f.file_path):
+            group = list(group)
+            tasks.append(dask.delayed(cls._extract_file_frames)(
+                group, output_paths[position:position + len(group)]))
+            position += len(group)
+
+        scheduler = 'threads' if getattr(sys, 'frozen', False) else 'processes'
+        results = dask.compute(*tasks, scheduler=scheduler, num_workers=num_workers)
+        succeeded = [ok for group_results in results for ok in group_results]
+        return [path if ok else None for path, ok in zip(output_paths, succeeded)]
+
+    @classmethod
+    def _extract_file_frames(cls, group: List[ImageFrameInfo],
+                             output_paths: List[str]) -> List[bool]:
+        """Extract frames of one source file to the given .tif paths (one task)."""
+        succeeded = []
+        if cls._is_edf_run(group):
+            try:
+                for frame, output_path in zip(cls._stream_edf_run(group), output_paths):
+                    fabio.tifimage.TifImage(data=frame.data, header=frame.header).write(output_path)
+                    succeeded.append(True)
+            except Exception as e:
+                print(f"Error streaming frames from {group[0].file_path}: {e}")
+
+        # Anything the stream did not deliver is extracted frame by frame
+        for frame_info, output_path in zip(group[len(succeeded):], output_paths[len(succeeded):]):
+            succeeded.append(cls.extract_frame_to_tif(frame_info, output_path))
+        return succeeded
+
+    @classmethod
+    def _is_edf_run(cls, group: List[ImageFrameInfo]) -> bool:
+        """Whether frames of one file are several consecutive frames of an EDF file."""
+        first = group[0].file_frame_index
+        return (FABIO_AVAILABLE and len(group) > 1 and group[0].is_multiframe
+                and cls._get_extension(group[0].file_path) == '.edf'
+                and [f.file_frame_index for f in group] == list(range(first, first + len(group))))
+
+    @staticmethod
+    def _stream_edf_run(group: List[ImageFrameInfo]):
+        """Iterate the FABIO frames of a consecutive EDF run in one sequential pass."""
+        first = group[0].file_frame_index
+        frames = fabio.edfimage.EdfImage.lazy_iterator(group[0].file_path)
+        return itertools.islice(frames, first, first + len(group))
+
 
 def validate_frame_ordering(frames: List[ImageFrameInfo]) -> bool:
     """
@@ -268,11 +807,18 @@ def validate_frame_ordering(frames: List[ImageFrameInfo]) -> bool:
             print(f"  Frame {i}: {frames[i].frame_index}")
             return False
 
-    # Check for metadata timestamps if available
+    # Check for metadata timestamps if available (headers not read yet are
+    # queried for just these keys rather than copied whole)
+    timestamp_keys = ('timestamp', 'DATE')
     timestamps = []
     for frame in frames:
-        if 'timestamp' in frame.metadata or 'DATE' in frame.metadata:
-            ts = frame.metadata.get('timestamp') or frame.metadata.get('DATE')
+        if frame._metadata is None and frame.is_multiframe:
+            metadata = ImageLoader.get_frame_metadata(frame.file_path, frame.file_frame_index,
+                                                      keys=timestamp_keys)
+        else:
+            metadata = frame.metadata
+        if 'timestamp' in metadata or 'DATE' in metadata:
+            ts = metadata.get('timestamp') or metadata.get('DATE')
             timestamps.append(ts)
 
     if timestamps and len(timestamps) == len(frames):
@@ -289,5 +835,4 @@ def get_image_files(directory: str, start_frame: int = 0,
 
     For multi-frame files, returns the filepath repeated for each frame.
     """
-    frames = ImageLoader.discover_frames(directory, start_frame, end_frame, step)
-    return [frame.file_path for frame in frames]
+    return [frame.file_path for frame in ImageLoader.iter_frames(directory, start_frame, end_frame, step)]
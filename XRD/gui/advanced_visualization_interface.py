@@ -24,14 +24,16 @@ from PyQt5.QtWidgets import (
     QRadioButton, QTableWidget, QTableWidgetItem
 )
 from PyQt5 import QtGui, QtCore
-from PyQt5.QtGui import QCursor, QPixmap, QIcon, QFont, QPalette, QColor
+from PyQt5.QtGui import QCursor, QPixmap, QImage, QIcon, QFont, QPalette, QColor
 from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal, QSize
 import json
 import os
 import sys
 import glob
+import hashlib
 from datetime import datetime
 import uuid
+import queue
 import threading
 import time
 
@@ -40,6 +42,92 @@ from XRD.visualization import data_visualization
 from XRD.core.gsas_processing import XRDDataset, Stages, PeakParams
 
 
+# Scaled gallery images persist across sessions, keyed by source path, mtime and size
+THUMBNAIL_CACHE_DIR = os.path.expanduser("~/.prisma/thumbs")
+
+
+def _thumb_cache_path(image_path, width, height):
+    """Cache file for image_path scaled to fit width x height (None if the image is unreadable)."""
+    try:
+        stat = os.stat(image_path)
+    except OSError:
+        return None
+    key = f"{os.path.abspath(image_path)}|{stat.st_mtime_ns}|{stat.st_size}|{width}x{height}"
+    return os.path.join(THUMBNAIL_CACHE_DIR, hashlib.sha1(key.encode()).hexdigest() + ".png")
+
+
+def _load_cached_thumb(cache_path):
+    """Previously saved scaled image, or a null QImage."""
+    if cache_path is None or not os.path.exists(cache_path):
+        return QImage()
+    return QImage(cache_path)
+
+
+def _save_cached_thumb(image, cache_path):
+    """Save a scaled image to the cache unless it is already there."""
+    if cache_path is None or os.path.exists(cache_path):
+        return
+    try:
+        os.makedirs(THUMBNAIL_CACHE_DIR, exist_ok=True)
+        # Written aside and renamed, so other sessions never read a partial file
+        temp_path = f"{cache_path}.{os.getpid()}.tmp"
+        if image.save(temp_path, "PNG"):
+            os.replace(temp_path, cache_path)
+    except OSError:
+        pass  # Cache is best effort
+
+
+class ThumbnailWorker(QThread):
+    """Worker thread decoding and scaling gallery images off the GUI thread."""
+
+    # image_id, kind ("thumb" 150x150 or "carousel" 600x400), image (null on failure)
+    image_ready = pyqtSignal(str, str, QImage)
+
+    def __init__(self):
+        super().__init__()
+        self.requests = queue.Queue()
+
+    def enqueue(self, image_id, image_path, kind="thumb"):
+        """Queue an image for decoding into the given kind of scaled image."""
+        self.requests.put((image_id, image_path, kind))
+
+    def stop(self):
+        """Finish after the queued images."""
+        self.requests.put(None)
+
+    def run(self):
+        """Decode queued images; QImage (unlike QPixmap) is safe off the GUI thread."""
+        while True:
+            request = self.requests.get()
+            if request is None:
+                break
+
+            image_id, image_path, kind = request
+
+            # Scaled images from an earlier session skip the decode entirely
+            thumb_path = _thumb_cache_path(image_path, 150, 150)
+            carousel_path = _thumb_cache_path(image_path, 600, 400)
+            cached = _load_cached_thumb(thumb_path if kind == "thumb" else carousel_path)
+            if not cached.isNull():
+                self.image_ready.emit(image_id, kind, cached)
+                continue
+
+            image = QImage(image_path)
+            if image.isNull():
+                self.image_ready.emit(image_id, kind, QImage())
+                continue
+            # Smooth scaling only for the large carousel view; the grid thumbnail
+            # is taken from that already filtered image with fast sampling
+            carousel = image.scaled(600, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+            _save_cached_thumb(carousel, carousel_path)
+            if kind == "thumb":
+                thumb = carousel.scaled(150, 150, Qt.KeepAspectRatio, Qt.FastTransformation)
+                _save_cached_thumb(thumb, thumb_path)
+                self.image_ready.emit(image_id, kind, thumb)
+            else:
+                self.image_ready.emit(image_id, kind, carousel)
+
+
 class ImageGalleryWidget(QWidget):
     """Enhanced image gallery with grid view and carousel functionality."""
 
@@ -50,8 +138,28 @@ class ImageGalleryWidget(QWidget):
         self.images = []  # List of image metadata
         self.current_view = "grid"  # "grid" or "carousel"
         self.current_index = 0
+        self._pending_images = {}  # image id -> image_info awaiting its thumbnail
+        # Carousel pixmaps are loaded on demand and kept only for the current
+        # image and its neighbours (image id -> QPixmap, None if unreadable)
+        self._carousel_pixmaps = {}
+        self._carousel_requested = set()
+        self._frame_pool = []  # Thumbnail frames of cleared images, reused by add_to_grid
         self.init_ui()
 
+        # Images are decoded and scaled in the background
+        self.thumbnail_worker = ThumbnailWorker()
+        self.thumbnail_worker.image_ready.connect(self.on_image_ready)
+        self.thumbnail_worker.start()
+        app = QApplication.instance()
+        if app is not None:
+            app.aboutToQuit.connect(self.stop_thumbnail_worker)
+
+    def stop_thumbnail_worker(self):
+        """Stop the decode thread (before the application exits)."""
+        if self.thumbnail_worker.isRunning():
+            self.thumbnail_worker.stop()
+            self.thumbnail_worker.wait()
+
     def init_ui(self):
         """Initialize the image gallery UI."""
         layout = QVBoxLayout(self)
@@ -155,10 +263,16 @@ class ImageGalleryWidget(QWidget):
             "path": image_path,
             "metadata": metadata,
             "timestamp": datetime.now(),
-            "id": str(uuid.uuid4())[:8]
+            "id": str(uuid.uuid4())[:8],
+            "thumb": None,        # 150x150 grid thumbnail
+            "thumb_label": None   # Grid label showing the thumbnail
         }
         self.images.append(image_info)
 
+        # Decode once in the background; repaints and view switches reuse the pixmaps
+        self._pending_images[image_info["id"]] = image_info
+        self.thumbnail_worker.enqueue(image_info["id"], image_path)
+
         # Add to grid view
         self.add_to_grid(image_info)
 
@@ -172,40 +286,89 @@ class ImageGalleryWidget(QWidget):
         row = len(self.images) // 3
         col = (len(self.images) - 1) % 3
 
-        # Create thumbnail frame
-        frame = QFrame()
-        frame.setFrameStyle(QFrame.StyledPanel)
-        frame.setMaximumSize(200, 250)
-        frame_layout = QVBoxLayout(frame)
+        # Thumbnail frame, reused from a cleared gallery when available
+        frame = self._frame_pool.pop() if self._frame_pool else self._build_new_frame()
+        frame.image_path = image_info["path"]
 
-        # Image thumbnail
-        try:
-            pixmap = QPixmap(image_info["path"])
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(150, 150, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                image_label = QLabel()
-                image_label.setPixmap(scaled_pixmap)
-                image_label.setAlignment(Qt.AlignCenter)
-                image_label.mousePressEvent = lambda event, path=image_info["path"]: self.imageClicked.emit(path)
-                frame_layout.addWidget(image_label)
-        except Exception as e:
-            # Fallback for loading issues
-            placeholder = QLabel("Image Error")
-            placeholder.setAlignment(Qt.AlignCenter)
-            frame_layout.addWidget(placeholder)
+        # Image thumbnail (filled in by on_image_ready)
+        frame.image_label.setText("Loading...")
+        image_info["thumb_label"] = frame.image_label
 
         # Image info
         info_text = f"{image_info['metadata'].get('peak_name', 'Unknown Peak')}\n"
         info_text += f"{image_info['metadata'].get('map_type', 'Unknown')}\n"
         info_text += f"{image_info['timestamp'].strftime('%H:%M:%S')}"
+        frame.info_label.setText(info_text)
 
-        info_label = QLabel(info_text)
+        self.grid_layout.addWidget(frame, row, col)
+        frame.show()
+
+    def _build_new_frame(self):
+        """Create an empty thumbnail frame (image label + info label)."""
+        frame = QFrame()
+        frame.setFrameStyle(QFrame.StyledPanel)
+        frame.setMaximumSize(200, 250)
+        frame_layout = QVBoxLayout(frame)
+
+        image_label = QLabel()
+        image_label.setAlignment(Qt.AlignCenter)
+        image_label.mousePressEvent = lambda event: self.imageClicked.emit(frame.image_path)
+        frame_layout.addWidget(image_label)
+
+        info_label = QLabel()
         info_label.setAlignment(Qt.AlignCenter)
         info_label.setWordWrap(True)
         info_label.setStyleSheet("font-size: 8pt; color: black;")
         frame_layout.addWidget(info_label)
 
-        self.grid_layout.addWidget(frame, row, col)
+        frame.image_label = image_label
+        frame.info_label = info_label
+        return frame
+
+    def on_image_ready(self, image_id, kind, image):
+        """Install a decoded image (GUI thread): only the QPixmap conversion happens here."""
+        if kind == "carousel":
+            self._carousel_requested.discard(image_id)
+            if image_id not in self._carousel_window():
+                return  # Navigated away (or cleared) meanwhile
+            self._carousel_pixmaps[image_id] = None if image.isNull() else QPixmap.fromImage(image)
+            if self.current_view == "carousel" and self.images[self.current_index]["id"] == image_id:
+                self.update_carousel_display()
+            return
+
+        image_info = self._pending_images.pop(image_id, None)
+        if image_info is None:
+            return  # Gallery was cleared meanwhile
+
+        if not image.isNull():
+            image_info["thumb"] = QPixmap.fromImage(image)
+            image_info["thumb_label"].setPixmap(image_info["thumb"])
+        else:
+            # Fallback for loading issues
+            image_info["thumb_label"].setText("Image Error")
+
+    def _carousel_window(self):
+        """Ids of the current carousel image and its neighbours."""
+        if not self.images:
+            return set()
+        n_images = len(self.images)
+        return {self.images[(self.current_index + offset) % n_images]["id"] for offset in (-1, 0, 1)}
+
+    def _request_carousel_window(self):
+        """Drop carousel pixmaps outside the window and request the missing ones."""
+        window = self._carousel_window()
+        for image_id in list(self._carousel_pixmaps):
+            if image_id not in window:
+                del self._carousel_pixmaps[image_id]
+
+        n_images = len(self.images)
+        # Current image first, then its neighbours (prefetch)
+        for offset in (0, 1, -1):
+            image_info = self.images[(self.current_index + offset) % n_images]
+            image_id = image_info["id"]
+            if image_id not in self._carousel_pixmaps and image_id not in self._carousel_requested:
+                self._carousel_requested.add(image_id)
+                self.thumbnail_worker.enqueue(image_id, image_info["path"], "carousel")
 
     def update_carousel_display(self):
         """Update the carousel view with current image."""
@@ -218,14 +381,14 @@ class ImageGalleryWidget(QWidget):
             self.current_index = 0
 
         current_image = self.images[self.current_index]
-
-        # Load and display image
-        try:
-            pixmap = QPixmap(current_image["path"])
-            if not pixmap.isNull():
-                scaled_pixmap = pixmap.scaled(600, 400, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.current_image_label.setPixmap(scaled_pixmap)
-        except Exception:
+        self._request_carousel_window()
+
+        # Display the carousel pixmap once loaded
+        if current_image["id"] not in self._carousel_pixmaps:
+            self.current_image_label.setText("Loading...")
+        elif self._carousel_pixmaps[current_image["id"]] is not None:
+            self.current_image_label.setPixmap(self._carousel_pixmaps[current_image["id"]])
+        else:
             self.current_image_label.setText("Failed to load image")
 
         # Update info
@@ -260,27 +423,50 @@ class ImageGalleryWidget(QWidget):
                                    QMessageBox.Yes | QMessageBox.No)
         if reply == QMessageBox.Yes:
             self.images.clear()
+            self._pending_images.clear()
+            self._carousel_pixmaps.clear()
             self.current_index = 0
 
-            # Clear grid
+            # Clear grid, keeping the frames for reuse
             for i in reversed(range(self.grid_layout.count())):
-                self.grid_layout.itemAt(i).widget().setParent(None)
+                frame = self.grid_layout.itemAt(i).widget()
+                self.grid_layout.removeWidget(frame)
+                frame.hide()
+                frame.image_label.clear()
+                self._frame_pool.append(frame)
 
             # Update carousel
             if self.current_view == "carousel":
                 self.update_carousel_display()
 
 
+# Base map types
+BASE_MAP_TYPES = ["strain", "d-spacing", "peak_area", "peak_width", "gamma_y", "gamma_z", "background"]
+
+# Map type choices: each base type followed by its variants
+_MAP_TYPES = [f"{prefix}{base_type}" for base_type in BASE_MAP_TYPES
+              for prefix in ("", "delta ", "abs ", "diff ")]
+
+
+def _peak_config(dataset):
+    """(active peak positions, position -> metadata) of a dataset's processing parameters."""
+    params = dataset.params
+    active_peaks = params.get_active_peak_positions()
+    return active_peaks, {position: params.get_peak_metadata(position) for position in active_peaks}
+
+
 class AnalysisTabWidget(QWidget):
     """Individual analysis tab with parameters and controls."""
 
     generateRequested = pyqtSignal(dict, str)  # Signal to generate visualization
     previewRequested = pyqtSignal(dict, str)   # Signal for preview
 
-    def __init__(self, tab_name="Analysis", dataset=None):
+    def __init__(self, tab_name="Analysis", dataset=None, active_peaks=None, peak_meta=None):
         super().__init__()
         self.tab_name = tab_name
         self.dataset = dataset
+        self.active_peaks = active_peaks  # Active peak positions (shared by the window)
+        self.peak_meta = peak_meta        # Peak position -> metadata dict
         self.peak_controls = {}
         self.preview_timer = QTimer()
         self.preview_timer.setSingleShot(True)
@@ -350,18 +536,7 @@ class AnalysisTabWidget(QWidget):
         layout.addWidget(QLabel("Map Type:"), 0, 0)
         self.map_type_combo = QComboBox()
 
-        # Base map types
-        base_types = ["strain", "d-spacing", "peak_area", "peak_width", "gamma_y", "gamma_z", "background"]
-        map_types = []
-
-        # Add base types and their variants
-        for base_type in base_types:
-            map_types.append(base_type)
-            map_types.append(f"delta {base_type}")
-            map_types.append(f"abs {base_type}")
-            map_types.append(f"diff {base_type}")
-
-        self.map_type_combo.addItems(map_types)
+        self.map_type_combo.addItems(_MAP_TYPES)
         self.map_type_combo.currentTextChanged.connect(self.on_parameter_changed)
         layout.addWidget(self.map_type_combo, 0, 1)
 
@@ -390,11 +565,12 @@ class AnalysisTabWidget(QWidget):
             layout.addWidget(QLabel("No dataset loaded"))
             return group
 
-        # Get available peaks from PeakParams
-        active_peaks = PeakParams.get_active_peaks()
+        # Active peaks and their metadata, precomputed by the window per dataset
+        if self.active_peaks is None or self.peak_meta is None:
+            self.active_peaks, self.peak_meta = _peak_config(self.dataset)
 
-        for i, peak_position in enumerate(active_peaks):
-            peak_metadata = PeakParams.get_peak_metadata(peak_position)
+        for i, peak_position in enumerate(self.active_peaks):
+            peak_metadata = self.peak_meta[peak_position]
             peak_frame = self.create_peak_control_frame(peak_position, peak_metadata, i)
             layout.addWidget(peak_frame)
 
@@ -429,7 +605,7 @@ class AnalysisTabWidget(QWidget):
         lower_limit = QDoubleSpinBox()
         lower_limit.setRange(-999.0, 999.0)
         lower_limit.setDecimals(3)
-        lower_limit.setValue(metadata['typical_range'][0])
+        lower_limit.setValue(metadata['limits'][0])
         lower_limit.valueChanged.connect(self.on_parameter_changed)
         layout.addWidget(lower_limit, 2, 1)
 
@@ -437,7 +613,7 @@ class AnalysisTabWidget(QWidget):
         upper_limit = QDoubleSpinBox()
         upper_limit.setRange(-999.0, 999.0)
         upper_limit.setDecimals(3)
-        upper_limit.setValue(metadata['typical_range'][1])
+        upper_limit.setValue(metadata['limits'][1])
         upper_limit.valueChanged.connect(self.on_parameter_changed)
         layout.addWidget(upper_limit, 2, 3)
 
@@ -529,6 +705,8 @@ class AdvancedVisualizationWindow(QMainWindow):
 
         # State variables
         self.current_dataset = None
+        self._active_peaks = None  # Active peak positions of the current dataset
+        self._peak_meta = None     # Peak position -> metadata, shared by all tabs
         self.save_folder = ""
         self.generation_queue = []
         self.unique_counter = 0
@@ -729,6 +907,7 @@ class AdvancedVisualizationWindow(QMainWindow):
         try:
             # Load dataset
             self.current_dataset = XRDDataset.load(zarr_path)
+            self._active_peaks, self._peak_meta = _peak_config(self.current_dataset)
 
             # Update info display
             info = f"Dataset: {zarr_name}\n"
@@ -745,6 +924,8 @@ class AdvancedVisualizationWindow(QMainWindow):
                 tab_widget = self.analysis_tabs.widget(i)
                 if isinstance(tab_widget, AnalysisTabWidget):
                     tab_widget.dataset = self.current_dataset
+                    tab_widget.active_peaks = self._active_peaks
+                    tab_widget.peak_meta = self._peak_meta
 
             self.statusBar().showMessage(f"Loaded: {zarr_name}")
 
@@ -765,7 +946,8 @@ class AdvancedVisualizationWindow(QMainWindow):
         tab_count = self.analysis_tabs.count() + 1
         tab_name = f"Analysis {tab_count}"
 
-        analysis_tab = AnalysisTabWidget(tab_name, self.current_dataset)
+        analysis_tab = AnalysisTabWidget(tab_name, self.current_dataset,
+                                         active_peaks=self._active_peaks, peak_meta=self._peak_meta)
         analysis_tab.generateRequested.connect(self.generate_visualization)
         analysis_tab.previewRequested.connect(self.preview_visualization)
 
@@ -17,7 +17,7 @@ import os
 from typing import Dict
 
 # Import data structures from core module
-from XRD.core.gsas_processing import GSASParams, PeakParams, Stages
+from XRD.core.gsas_processing import GSASParams, PeakParams, Stages, Precision
 
 
 def load_recipe_from_file(recipe_path: str) -> dict:
@@ -138,5 +138,6 @@ def create_gsas_params_from_recipe(recipe: dict) -> GSASParams:
         step=recipe['step'],
         pixel_size=pixel_size,
         wavelength=wavelength,
-        detector_size=detector_size
+        detector_size=detector_size,
+        precision=Precision(recipe.get('precision', 'float32'))
     )
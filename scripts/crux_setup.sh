@@ -331,7 +331,17 @@ fi
 
 echo ""
 
-echo "Step 9: Creating activation helper script..."
+echo "Step 9: Precompiling XRD bytecode..."
+echo "-----------------------------------------------------------------------"
+
+# Workers otherwise compile every module on first import (per node, on Lustre)
+python3 -m compileall -q -j 0 "${PROCESSOR_DIR}/XRD" > /dev/null && \
+    echo -e "${GREEN}✓ Bytecode cached in XRD/**/__pycache__${NC}" || \
+    echo -e "${YELLOW}⚠ Bytecode precompilation failed (modules will compile on first import)${NC}"
+
+echo ""
+
+echo "Step 10: Creating activation helper script..."
 echo "-----------------------------------------------------------------------"
 
 # Create activation script
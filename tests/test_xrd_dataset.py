@@ -0,0 +1,166 @@
+"""Tests for XRDDataset construction buffers, frame writes and Zarr round trips."""
+
+import os
+from types import SimpleNamespace
+
+import dask.array as da
+import numpy as np
+import pandas as pd
+import pytest
+
+# Allow importing gsas_processing without a configured GSAS-II install
+os.environ.setdefault('PYINSTALLER_BUILD', '1')
+from XRD.core.gsas_processing import Stages, XRDDataset, subtract_datasets  # noqa: E402
+
+
+def _params():
+    return SimpleNamespace(azimuths=(0, 360), spacing=90, sample='S', stage=Stages.BEF,
+                           frames=(0, -1), active_peaks=[])
+
+
+def _dataset(max_extra_measurements):
+    params = _params()
+    dataset = XRDDataset(2, 3, 4, ['pos', 'd'], params,
+                         max_extra_measurements=max_extra_measurements)
+    d = np.arange(1, 25, dtype='float32').reshape(2, 3, 4)
+    dataset._numpy_data[..., dataset.col_idx['d']] = d
+    return dataset, d
+
+
+@pytest.mark.parametrize('max_extra_measurements', [0, 1, 2])
+def test_calculate_strain_grows_exhausted_slots(max_extra_measurements):
+    dataset, d = _dataset(max_extra_measurements)
+    reference_d = np.full((2, 4), 2.0)
+
+    dataset.calculate_strain(reference_d)
+
+    expected = (d - 2.0) / 2.0
+    np.testing.assert_allclose(dataset._numpy_data[..., dataset.col_idx['strain']], expected)
+    np.testing.assert_allclose(dataset._numpy_data[..., dataset.col_idx['abs strain']], np.abs(expected))
+
+
+def test_calculate_strain_after_add_measurement_uses_spare_slot():
+    dataset, d = _dataset(2)
+    dataset.add_measurement('x', np.ones((2, 3, 4), dtype='float32'))
+
+    dataset.calculate_strain(np.full((2, 4), 2.0))
+
+    np.testing.assert_allclose(dataset._numpy_data[..., dataset.col_idx['x']], 1.0)
+    np.testing.assert_allclose(dataset._numpy_data[..., dataset.col_idx['strain']], (d - 2.0) / 2.0)
+    assert dataset.measurement_cols == ['pos', 'd', 'x', 'strain', 'abs strain']
+
+
+def test_save_load_round_trip_uses_reassigned_arrays(tmp_path):
+    dataset, d = _dataset(2)
+    dataset.finalize()
+    # Reassigned after finalize(), as subtract_datasets does
+    dataset.data = da.full(dataset.data.shape, 2.0, dtype='float32', chunks=dataset.chunks)
+    dataset.frame_numbers = da.full(dataset.frame_numbers.shape, 7, dtype='int32')
+    dataset.azimuth_angles = da.full(dataset.azimuth_angles.shape, 45.0, dtype='float32')
+
+    dataset.save(str(tmp_path))
+    loaded = XRDDataset.load(str(tmp_path), _params())
+
+    np.testing.assert_array_equal(loaded.data.compute(), 2.0)
+    np.testing.assert_array_equal(loaded.frame_numbers.compute(), 7)
+    np.testing.assert_array_equal(loaded.azimuth_angles.compute(), 45.0)
+
+
+def test_save_load_round_trip_from_construction_buffers(tmp_path):
+    dataset, d = _dataset(2)
+    dataset._numpy_frame_numbers[:] = 3
+    dataset.finalize()
+
+    dataset.save(str(tmp_path))
+    loaded = XRDDataset.load(str(tmp_path), _params())
+
+    np.testing.assert_array_equal(loaded.data.compute()[..., loaded.col_idx['d']], d)
+    np.testing.assert_array_equal(loaded.frame_numbers.compute(), 3)
+
+
+def _write_per_element(dataset, peak_idx, frame_idx, df):
+    """Reference writer: the original row-by-row, column-by-column set_frame_data."""
+    df_sorted = df.sort_values('azimuth').reset_index(drop=True)
+    for _, row in df_sorted.iterrows():
+        az_idx = dataset._azimuth_to_index(row['azimuth'])
+        if dataset._numpy_azimuth_angles[peak_idx, az_idx] == 0:
+            dataset._numpy_azimuth_angles[peak_idx, az_idx] = row['azimuth']
+    if 'frame' in df_sorted.columns and len(df_sorted) > 0:
+        dataset._numpy_frame_numbers[peak_idx, frame_idx] = df_sorted.iloc[0]['frame']
+    for _, row in df_sorted.iterrows():
+        az_idx = dataset._azimuth_to_index(row['azimuth'])
+        for col in dataset.measurement_cols:
+            if col in row and not pd.isna(row[col]):
+                dataset._numpy_data[peak_idx, frame_idx, az_idx, dataset.col_idx[col]] = row[col]
+
+
+def _frame_df(frame, seed, columns):
+    rng = np.random.default_rng(seed)
+    azimuths = rng.permutation([0.0, 90.0, 180.0, 270.0])  # unsorted, as from GSAS-II
+    df = pd.DataFrame({'pos': rng.random(4), 'area': rng.random(4), 'd': rng.random(4),
+                       'azimuth': azimuths, 'frame': np.full(4, frame), 'extra': rng.random(4)})
+    df.loc[1, 'area'] = np.nan  # NaN values are skipped
+    return df[columns]
+
+
+# Column order differs from measurement_cols ['pos', 'area', 'd']
+_LAYOUT = ['d', 'azimuth', 'extra', 'pos', 'frame', 'area']
+_OTHER_LAYOUT = ['frame', 'azimuth', 'pos', 'd']
+
+
+def _layout_dataset():
+    return XRDDataset(2, 4, 4, ['pos', 'area', 'd'], _params())
+
+
+def _assert_same_buffers(actual, expected):
+    np.testing.assert_array_equal(actual._numpy_data, expected._numpy_data)
+    np.testing.assert_array_equal(actual._numpy_frame_numbers, expected._numpy_frame_numbers)
+    np.testing.assert_array_equal(actual._numpy_azimuth_angles, expected._numpy_azimuth_angles)
+
+
+def test_set_frame_data_matches_per_element_writes():
+    actual, expected = _layout_dataset(), _layout_dataset()
+    for frame_idx in range(4):
+        df = _frame_df(frame_idx + 10, frame_idx, _LAYOUT if frame_idx % 2 else _OTHER_LAYOUT)
+        actual.set_frame_data(1, frame_idx, df)
+        _write_per_element(expected, 1, frame_idx, df)
+    _assert_same_buffers(actual, expected)
+
+
+def test_set_peak_data_matches_per_element_writes():
+    actual, expected = _layout_dataset(), _layout_dataset()
+    frame_dfs = [_frame_df(10, 0, _LAYOUT), None, _frame_df(12, 2, _OTHER_LAYOUT),
+                 _frame_df(13, 3, _LAYOUT)]
+    for peak_idx in range(2):
+        actual.set_peak_data(peak_idx, frame_dfs)
+        for frame_idx, df in enumerate(frame_dfs):
+            if df is not None:
+                _write_per_element(expected, peak_idx, frame_idx, df)
+    _assert_same_buffers(actual, expected)
+
+
+def test_column_permutation_follows_measurement_order():
+    dataset = _layout_dataset()
+    cols_present, col_indices = dataset._column_permutation(pd.Index(_LAYOUT))
+    assert cols_present == ['pos', 'area', 'd']
+    np.testing.assert_array_equal(col_indices, [0, 1, 2])
+    cols_present, col_indices = dataset._column_permutation(pd.Index(_OTHER_LAYOUT))
+    assert cols_present == ['pos', 'd']
+    np.testing.assert_array_equal(col_indices, [0, 2])
+
+
+def test_subtract_datasets_saves_differences(tmp_path):
+    before, d = _dataset(2)
+    after, _ = _dataset(2)
+    after._numpy_data[..., after.col_idx['d']] = d + 2.0
+    after._numpy_frame_numbers[:] = 5
+
+    diff = subtract_datasets(before, after, ['d'])
+    assert diff._numpy_data is None
+
+    diff.save(str(tmp_path))
+    loaded = XRDDataset.load(str(tmp_path), _params())
+
+    np.testing.assert_allclose(loaded.data.compute()[..., loaded.col_idx['diff d']], 2.0)
+    np.testing.assert_array_equal(loaded.data.compute()[..., loaded.col_idx['d']], d + 2.0)
+    np.testing.assert_array_equal(loaded.frame_numbers.compute(), 5)